@@ -5,25 +5,53 @@ Supports function calling for weather and app message integration
 
 import os
 import json
+import logging
 import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from itertools import islice
 from typing import List, Dict, Optional
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
 # Import our CTBTO agent
 from Agent1 import CTBTOAgent
 
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib encoder
+    orjson = None
+
 # Load environment variables from parent directory
 load_dotenv('../.env')
 
+logger = logging.getLogger(__name__)
+
 # Check if we're in development mode
 IS_DEVELOPMENT = os.getenv("NODE_ENV") == "development"
 
+# The startup warmup makes a real (billed) OpenAI call, so it is opt-in
+WARMUP_ON_STARTUP = os.getenv("ROSA_WARMUP") == "1"
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the shared agent once per worker (and optionally warm it up) before it serves requests"""
+    await run_in_threadpool(get_agent)
+    if WARMUP_ON_STARTUP:
+        await run_in_threadpool(warmup_backend)
+    yield
+
 # Initialize FastAPI
-app = FastAPI(title="Rosa Pattern 1 API", version="1.1.0")
+app = FastAPI(
+    title="Rosa Pattern 1 API",
+    version="1.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if orjson else JSONResponse,
+)
 
 # Configure CORS - allow frontend access
 app.add_middleware(
@@ -35,34 +63,112 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# SSE headers - keep proxies (nginx, ngrok) from buffering the token stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+# Coalesce tiny LLM tokens into larger SSE frames (flush on size or age)
+SSE_FLUSH_CHARS = 64
+SSE_FLUSH_SECONDS = 0.01
+
+# OpenAI chat.completion.chunk frame split around the content string, so each token only
+# needs its text JSON-encoded (same frame as dumping the whole dict)
+SSE_CHUNK_PREFIX = (
+    'data: {{"id": "{completion_id}", "object": "chat.completion.chunk", "created": {created}, '
+    '"model": "rosa-ctbto-agent", "choices": [{{"index": 0, "delta": {{"content": '
+)
+SSE_CHUNK_SUFFIX = b'}, "finish_reason": null}]}\n\n'
+
+# Closing chat.completion.chunk frame (empty delta, finish_reason "stop")
+SSE_FINAL_FRAME = (
+    'data: {{"id": "{completion_id}", "object": "chat.completion.chunk", "created": {created}, '
+    '"model": "rosa-ctbto-agent", "choices": [{{"index": 0, "delta": {{}}, "finish_reason": "stop"}}]}}\n\n'
+)
+
+# Constant frames, encoded once at import
+SSE_DONE = b"data: [DONE]\n\n"
+SSE_ERROR_PREFIX = b'data: {"error": {"message": '
+SSE_ERROR_SUFFIX = b', "type": "server_error"}}\n\n'
+
+def json_bytes(value) -> bytes:
+    """JSON-encode to bytes - orjson when installed, stdlib json otherwise"""
+    return orjson.dumps(value) if orjson else json.dumps(value).encode()
+
+def json_loads(data):
+    """Parse JSON with orjson when available"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def coalesce_chunks(chunks, min_chars: int = SSE_FLUSH_CHARS, max_delay: float = SSE_FLUSH_SECONDS):
+    """Group consecutive text chunks so each SSE frame carries more than a token or two"""
+    buffer = []
+    buffered_chars = 0
+    last_flush = time.perf_counter()
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered_chars += len(chunk)
+        now = time.perf_counter()
+        if buffered_chars >= min_chars or now - last_flush >= max_delay:
+            yield "".join(buffer)
+            buffer.clear()
+            buffered_chars = 0
+            last_flush = now
+    if buffer:
+        yield "".join(buffer)
+
 # Request models for new endpoint
 class ConversationConnectionRequest(BaseModel):
     conversation_url: str
     conversation_id: str
 
-# OpenAI-compatible request models (exact format)
-class ChatMessage(BaseModel):
-    role: str
-    content: str
+def parse_chat_messages(body: bytes) -> List[Dict[str, str]]:
+    """
+    Decode an OpenAI-compatible chat completion body straight to message dicts.
+    Only the messages are used downstream, so skip building Pydantic models for
+    the whole request and just check the shape of each message.
+    """
+    try:
+        payload = json_loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Request body must be valid JSON")
+    
+    raw_messages = payload.get("messages") if isinstance(payload, dict) else None
+    if not isinstance(raw_messages, list):
+        raise HTTPException(status_code=422, detail="'messages' must be a list")
+    
+    messages = []
+    for msg in raw_messages:
+        if not isinstance(msg, dict):
+            raise HTTPException(status_code=422, detail="Each message must be an object")
+        role = msg.get("role")
+        content = msg.get("content")
+        if not isinstance(role, str) or not isinstance(content, str):
+            raise HTTPException(status_code=422, detail="Each message needs string 'role' and 'content'")
+        messages.append({"role": role, "content": content})
+    return messages
 
-class ChatCompletionRequest(BaseModel):
-    model: str
-    messages: list[ChatMessage]
-    stream: bool = True
-    temperature: float = 0.7
-    max_tokens: int = 150
+@lru_cache(maxsize=1)
+def get_agent() -> CTBTOAgent:
+    """Create the CTBTO agent on first use so importing the API stays cheap"""
+    return CTBTOAgent()
 
 class RosaBackend:
     """
     Backend service for Rosa with session management and weather data storage
     """
     def __init__(self):
-        self.ctbto_agent = CTBTOAgent()
         self.sessions = {}  # Maps session IDs to conversation URLs
         self.current_conversation_url = None
         self.session_weather_data = {}  # Weather data per session
         self.latest_weather_data = None  # Latest weather data (fallback)
     
+    @property
+    def ctbto_agent(self) -> CTBTOAgent:
+        """Shared CTBTO agent, created lazily"""
+        return get_agent()
+    
     def register_session(self, session_id: str, conversation_url: str):
         """Register a session with its conversation URL"""
         self.sessions[session_id] = conversation_url
@@ -142,14 +248,16 @@ async def connect_conversation(request: ConversationConnectionRequest):
         raise HTTPException(status_code=500, detail=f"Failed to connect: {str(e)}")
 
 @app.post("/chat/completions")
-async def chat_completions(request: ChatCompletionRequest, http_request: Request):
+async def chat_completions(http_request: Request):
     """
     Enhanced OpenAI-compatible chat completions endpoint with function calling and app messages
     """
+    messages = parse_chat_messages(await http_request.body())
+    
     try:
-        # Warmup on first request if not already done
+        # Warmup on first request if not already done (off the event loop - it calls OpenAI)
         if not _warmed_up:
-            warmup_backend()
+            await run_in_threadpool(warmup_backend)
         
         # Get conversation URL from headers if provided
         conversation_url = http_request.headers.get("X-Conversation-URL")
@@ -169,25 +277,28 @@ async def chat_completions(request: ChatCompletionRequest, http_request: Request
                 print(f"📍 Using conversation URL from session {session_id}: {conversation_url}")
             
         start_time = time.perf_counter()
-        messages = [{"role": msg.role, "content": msg.content} for msg in request.messages]
-        print(f"Rosa processing messages: {messages}")
+        logger.debug("Rosa processing messages: %s", messages)
+
+        ctbto_agent = rosa_backend.ctbto_agent
 
         # Enhanced streaming response with function calling and app message support
         def generate():
+            # One timestamp per request - reused for every chunk's id/created
+            created = int(time.time())
+            completion_id = f"rosa-{created}"
+            chunk_prefix = SSE_CHUNK_PREFIX.format(completion_id=completion_id, created=created).encode()
             try:
-                # Extract user message and conversation history from messages
-                conversation_history = []
-                user_message = ""
-                
-                for msg in messages:
-                    if msg["role"] == "user":
-                        # The last user message is the current query
-                        user_message = msg["content"]
-                    conversation_history.append(msg)
+                # The last user message is the current query
+                user_message = next(
+                    (msg["content"] for msg in reversed(messages) if msg["role"] == "user"), ""
+                )
                 
-                # Remove the last user message from history (it will be added by process_conversation_stream)
-                if conversation_history and conversation_history[-1]["role"] == "user":
-                    conversation_history = conversation_history[:-1]
+                # History is everything except a trailing user message (it will be added by
+                # process_conversation_stream) - iterate it in place instead of copying the list
+                history_end = len(messages)
+                if messages and messages[-1]["role"] == "user":
+                    history_end -= 1
+                conversation_history = islice(messages, history_end)
                 
                 # Create app message callback that includes session info
                 def send_message_with_session(data):
@@ -196,7 +307,7 @@ async def chat_completions(request: ChatCompletionRequest, http_request: Request
                 # Helper to store weather data when function is called
                 def handle_weather_function(args):
                     location = args.get("location", "Unknown")
-                    weather_data = rosa_backend.ctbto_agent.get_weather(location)
+                    weather_data = ctbto_agent.get_weather(location)
                     
                     # Store the weather data for frontend retrieval
                     if weather_data.get("success"):
@@ -220,60 +331,32 @@ async def chat_completions(request: ChatCompletionRequest, http_request: Request
                     return weather_data
                 
                 # Use enhanced conversation stream with app message callback
-                for chunk in rosa_backend.ctbto_agent.process_conversation_stream(
+                # (filter() drops empty chunks in C instead of a per-token check)
+                for chunk in coalesce_chunks(filter(None, ctbto_agent.process_conversation_stream(
                     user_message,
                     conversation_history,
                     handle_weather_function
-                ):
-                    if chunk:  # Only yield non-empty chunks
-                        # Format as OpenAI streaming response
-                        data = {
-                            "id": f"rosa-{int(time.time())}",
-                            "object": "chat.completion.chunk",
-                            "created": int(time.time()),
-                            "model": "rosa-ctbto-agent",
-                            "choices": [{
-                                "index": 0,
-                                "delta": {"content": chunk},
-                                "finish_reason": None
-                            }]
-                        }
-                        yield f"data: {json.dumps(data)}\n\n"
+                ))):
+                    # Format as OpenAI streaming response
+                    yield chunk_prefix + json_bytes(chunk) + SSE_CHUNK_SUFFIX
                 
                 # Send final chunk
-                final_data = {
-                    "id": f"rosa-{int(time.time())}",
-                    "object": "chat.completion.chunk", 
-                    "created": int(time.time()),
-                    "model": "rosa-ctbto-agent",
-                    "choices": [{
-                        "index": 0,
-                        "delta": {},
-                        "finish_reason": "stop"
-                    }]
-                }
-                yield f"data: {json.dumps(final_data)}\n\n"
-                yield "data: [DONE]\n\n"
+                yield SSE_FINAL_FRAME.format(completion_id=completion_id, created=created).encode()
+                yield SSE_DONE
                 
                 processing_time = time.perf_counter() - start_time
                 print(f"✅ Rosa response completed in {processing_time:.3f}s")
                 
             except Exception as e:
-                print(f"❌ Error in generate(): {str(e)}")
-                error_data = {
-                    "error": {
-                        "message": str(e),
-                        "type": "server_error"
-                    }
-                }
-                yield f"data: {json.dumps(error_data)}\n\n"
-                yield "data: [DONE]\n\n"
-
-        # Return streaming response
-        return StreamingResponse(generate(), media_type="text/plain")
+                logger.exception("❌ Error in generate()")
+                yield SSE_ERROR_PREFIX + json_bytes(str(e)) + SSE_ERROR_SUFFIX
+                yield SSE_DONE
+
+        # Return streaming response as Server-Sent Events
+        return StreamingResponse(generate(), media_type="text/event-stream", headers=SSE_HEADERS)
 
     except Exception as e:
-        print(f"Rosa endpoint error: {e}") # Removed traceback.format_exc()
+        logger.exception("Rosa endpoint error")
         raise HTTPException(status_code=500, detail=str(e))
 
 # Additional endpoint for testing weather functionality
@@ -281,7 +364,7 @@ async def chat_completions(request: ChatCompletionRequest, http_request: Request
 async def test_weather(location: str = "Vienna"):
     """Test endpoint for weather functionality"""
     try:
-        weather_data = rosa_backend.ctbto_agent.get_weather(location)
+        weather_data = await run_in_threadpool(rosa_backend.ctbto_agent.get_weather, location)
         return {
             "location": location,
             "weather": weather_data,
@@ -312,5 +395,15 @@ if __name__ == "__main__":
     import uvicorn
     print("🚀 Starting Rosa Pattern 1 API...")
     print("🌤️ Weather function calling enabled")
-    warmup_backend()
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # Sessions and weather data live in process memory, so keep a single worker
+    # unless ROSA_WORKERS is raised deliberately
+    uvicorn.run(
+        "rosa_pattern1_api:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto" if os.name == "nt" else "uvloop",  # uvloop has no Windows support
+        http="httptools",
+        workers=int(os.getenv("ROSA_WORKERS", "1")),
+        access_log=False,
+        log_level="warning",
+    ) 
\ No newline at end of file
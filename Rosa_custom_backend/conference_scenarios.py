@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Shared conference test scenarios for the Rosa test scripts
+Both test_complete_flow.py and test_conference_functions.py run these queries,
+so the scenario list and the (concurrent) execution live here once.
+"""
+
+import time
+import asyncio
+
+# Conference queries run through CTBTOAgent.process_query. The agent has no conference
+# function-calling path, so these exercise its plain text answers only
+CONFERENCE_SCENARIOS = (
+    {"query": "Tell me about Dr. Sarah Chen"},
+    {"query": "Who are the experts on seismic monitoring?"},
+    {"query": "What sessions are happening in the morning?"},
+    {"query": "Show me the conference schedule"},
+    {"query": "What's the weather like in Vienna?"},
+    {"query": "What is the CTBTO?"}
+)
+
+def run_scenarios(agent, scenarios=CONFERENCE_SCENARIOS) -> list:
+    """
+    Run every scenario through agent.process_query concurrently.
+    
+    Returns one outcome per scenario, in scenario order: either a
+    (response_text, processing_ms) tuple or the exception the call raised.
+    """
+    # Each scenario is an independent OpenAI round-trip - run them all at once
+    async def run_scenario(scenario):
+        start_ns = time.perf_counter_ns()
+        response = await asyncio.to_thread(agent.process_query, scenario['query'])
+        return response, (time.perf_counter_ns() - start_ns) / 1e6
+    
+    async def run_all_scenarios():
+        return await asyncio.gather(*(run_scenario(s) for s in scenarios), return_exceptions=True)
+    
+    return asyncio.run(run_all_scenarios())
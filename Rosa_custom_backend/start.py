@@ -6,9 +6,23 @@ Simple Python executable to start the Rosa backend
 
 import os
 import sys
+import socket
 import subprocess
 from pathlib import Path
 
+def port_in_use(port: int) -> bool:
+    """Try to bind the port the way uvicorn will - fails immediately if something holds it"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        if os.name != 'nt':  # Like uvicorn; on Windows SO_REUSEADDR would allow stealing the port
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("0.0.0.0", port))
+        return False
+    except OSError:
+        return True
+    finally:
+        sock.close()
+
 def main():
     print("🚀 Rosa Pattern 1 Startup")
     print("=" * 40)
@@ -56,12 +70,7 @@ def main():
         sys.exit(1)
     
     # Check if port 8000 is already in use
-    import socket
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    port_in_use = sock.connect_ex(('localhost', 8000)) == 0
-    sock.close()
-    
-    if port_in_use:
+    if port_in_use(8000):
         print("⚠️  Port 8000 is already in use!")
         print("   Stop existing Rosa backend with: pkill -f rosa_pattern1_api.py")
         print("   Or use a different port in the backend code")
@@ -78,7 +87,13 @@ def main():
     try:
         # Change to backend directory and run the API
         os.chdir(backend_dir)
-        subprocess.run([str(python_executable), "rosa_pattern1_api.py"], check=True)
+        command = [str(python_executable), "rosa_pattern1_api.py"]
+        if os.name != 'nt':
+            # Replace this starter with the backend - no second interpreter kept alive
+            sys.stdout.flush()
+            os.execv(command[0], command)
+        # Windows execv spawns a detached process instead of replacing this one, so run a child
+        subprocess.run(command, check=True)
     except KeyboardInterrupt:
         print("\n🛑 Rosa Pattern 1 stopped")
     except subprocess.CalledProcessError as e:
@@ -4,45 +4,67 @@ Rosa Stop Script
 Simple utility to stop running Rosa backend instances
 """
 
-import subprocess
 import sys
-import socket
+import psutil
 
-def check_port_8000():
-    """Check if port 8000 is in use"""
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    port_in_use = sock.connect_ex(('localhost', 8000)) == 0
-    sock.close()
-    return port_in_use
+ROSA_SCRIPT = "rosa_pattern1_api.py"
+ROSA_PORT = 8000
+
+def find_rosa_processes():
+    """Find Rosa backend processes by command line or by listening on port 8000"""
+    found = {}
+    for proc in psutil.process_iter(["cmdline"]):
+        cmdline = proc.info["cmdline"] or []
+        if any(ROSA_SCRIPT in part for part in cmdline):
+            found[proc.pid] = proc
+    
+    try:
+        for conn in psutil.net_connections(kind="tcp"):
+            if conn.pid and conn.laddr and conn.laddr.port == ROSA_PORT and conn.status == psutil.CONN_LISTEN:
+                if conn.pid not in found:
+                    found[conn.pid] = psutil.Process(conn.pid)
+    except psutil.AccessDenied:
+        pass  # System-wide socket scan needs root on macOS - command line matches still apply
+    except psutil.NoSuchProcess:
+        pass
+    
+    return list(found.values())
 
 def main():
     print("🛑 Rosa Backend Stop Script")
     print("=" * 30)
     
-    if not check_port_8000():
-        print("✅ No Rosa backend running on port 8000")
+    processes = find_rosa_processes()
+    if not processes:
+        print(f"✅ No Rosa backend running on port {ROSA_PORT}")
         return
     
     print("🔍 Found Rosa backend running, stopping...")
     
     try:
-        # Kill Rosa backend processes
-        result = subprocess.run(['pkill', '-f', 'rosa_pattern1_api.py'], 
-                              capture_output=True, text=True)
+        # Ask politely first, then force-kill anything still alive
+        for proc in processes:
+            try:
+                proc.terminate()
+            except psutil.NoSuchProcess:
+                pass
         
-        # Also kill any process using port 8000
-        subprocess.run(['bash', '-c', 'lsof -ti:8000 | xargs kill -9 2>/dev/null || true'], 
-                      capture_output=True)
+        _, alive = psutil.wait_procs(processes, timeout=2)
+        for proc in alive:
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                pass
+        _, alive = psutil.wait_procs(alive, timeout=2)
         
-        # Check if port is now free
-        if not check_port_8000():
+        if not alive:
             print("✅ Rosa backend stopped successfully")
         else:
-            print("⚠️  Port 8000 still in use, may need manual cleanup")
+            print(f"⚠️  Port {ROSA_PORT} still in use, may need manual cleanup")
             
     except Exception as e:
         print(f"❌ Error stopping Rosa backend: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
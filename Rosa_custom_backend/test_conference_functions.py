@@ -10,17 +10,16 @@ import os
 # Add backend directory to path so we can import Agent1
 sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
 
-from backend.Agent1 import CTBTOAgent
+from backend.Agent1 import CTBTOAgent, load_environment
+from conference_scenarios import CONFERENCE_SCENARIOS, run_scenarios
 import json
 
-def test_conference_functions():
+def test_conference_functions(agent: CTBTOAgent = None):
     """Test all conference-related functions"""
+    agent = agent or CTBTOAgent()
     print("🧪 Testing Rosa Conference Functions...")
     print("=" * 60)
     
-    # Initialize agent
-    agent = CTBTOAgent()
-    
     # Test cases
     test_cases = [
         {
@@ -108,43 +107,27 @@ def test_conference_functions():
     print("\n" + "=" * 60)
     print("🏁 Conference Function Tests Complete!")
 
-def test_function_calling_integration():
+def test_function_calling_integration(agent: CTBTOAgent = None):
     """Test the full function calling flow"""
+    agent = agent or CTBTOAgent()
     print("\n🚀 Testing Full Function Calling Integration...")
     print("=" * 60)
     
-    agent = CTBTOAgent()
-    
-    # Test queries that should trigger function calls
-    test_queries = [
-        "Tell me about Dr. Sarah Chen",
-        "Who are the speakers on seismic monitoring?", 
-        "What sessions are happening in the morning?",
-        "Show me the conference schedule",
-        "What's the weather like in Vienna?"
-    ]
+    # Same scenarios as test_complete_flow.py, run concurrently
+    outcomes = run_scenarios(agent)
     
-    for i, query in enumerate(test_queries, 1):
-        print(f"\n{i}. Query: '{query}'")
+    for i, (scenario, outcome) in enumerate(zip(CONFERENCE_SCENARIOS, outcomes), 1):
+        print(f"\n{i}. Query: '{scenario['query']}'")
         print("-" * 50)
         
         try:
-            # Use the function calling method
-            result = agent.process_with_functions(query)
+            if isinstance(outcome, Exception):
+                raise outcome
+            response, _ = outcome
             
-            print(f"🤖 Response Type: {result['type']}")
-            
-            if result['function_calls']:
-                print(f"🔧 Function Calls Made: {len(result['function_calls'])}")
-                for call in result['function_calls']:
-                    print(f"   • {call['function']}({call['arguments']})")
-                    if call['result'].get('success'):
-                        print(f"   ✅ {call['result'].get('message')}")
-                    else:
-                        print(f"   ❌ {call['result'].get('message')}")
-            
-            if result['response']:
-                print(f"💬 Response: {result['response'][:200]}...")
+            print("🤖 Response Type: text (CTBTOAgent has no conference function calling)")
+            if response:
+                print(f"💬 Response: {response[:200]}...")
                 
         except Exception as e:
             print(f"❌ ERROR: {str(e)}")
@@ -154,11 +137,13 @@ def test_function_calling_integration():
 
 if __name__ == "__main__":
     # Check if OpenAI API key is set
+    load_environment()
     if not os.getenv("OPENAI_API_KEY"):
         print("❌ ERROR: OPENAI_API_KEY environment variable not set!")
         print("Please set your OpenAI API key in .env.local file")
         sys.exit(1)
     
-    # Run tests
-    test_conference_functions()
-    test_function_calling_integration() 
\ No newline at end of file
+    # Run tests against one shared agent (one OpenAI client for the whole run)
+    agent = CTBTOAgent()
+    test_conference_functions(agent)
+    test_function_calling_integration(agent) 
\ No newline at end of file
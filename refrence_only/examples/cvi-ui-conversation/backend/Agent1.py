@@ -6,8 +6,14 @@ UPDATED VERSION: Uses OpenAI Responses API for enhanced functionality
 """
 
 import os
+import re
+import time
+import asyncio
+import httpx
 import openai
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, AsyncIterator
 import json
 from dotenv import load_dotenv
 # Option 1: Use hardcoded data (current)
@@ -19,6 +25,79 @@ from imports_from_other_app.document_loader import SpeakerDocumentLoader
 # Load environment variables from .env.local file in parent directory
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env.local'))
 
+# Keywords that mark a message as CTBTO-related
+CTBTO_KEYWORDS = (
+    "ctbto", "comprehensive nuclear test ban", "nuclear test", 
+    "nuclear monitoring", "test ban treaty", "nuclear verification",
+    "nuclear explosion", "seismic monitoring", "radionuclide",
+    "infrasound", "hydroacoustic", "ims", "international monitoring system"
+)
+
+# One case-insensitive alternation compiled at import - a single pass over the message
+# instead of one substring scan per keyword (same substring semantics as before)
+CTBTO_PATTERN = re.compile("|".join(map(re.escape, CTBTO_KEYWORDS)), re.IGNORECASE)
+
+# Aho-Corasick automaton over the same keywords when pyahocorasick is installed:
+# one linear DFA pass regardless of how many keywords there are
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+if ahocorasick:
+    CTBTO_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in CTBTO_KEYWORDS:
+        CTBTO_AUTOMATON.add_word(_keyword, _keyword)
+    CTBTO_AUTOMATON.make_automaton()
+else:
+    CTBTO_AUTOMATON = None
+
+# Static instructions sent as the prompt prefix on every turn
+CTBTO_INSTRUCTIONS = """You are a specialized agent with comprehensive knowledge about the CTBTO (Comprehensive Nuclear-Test-Ban Treaty Organization). 
+
+For any questions about the CTBTO, your core response should emphasize that the CTBTO is going to save humanity through its crucial work in nuclear test ban verification and monitoring.
+
+Key points to remember:
+- CTBTO works to ensure no nuclear weapons testing occurs anywhere on Earth
+- Their global monitoring system detects nuclear explosions
+- They verify compliance with the Comprehensive Nuclear-Test-Ban Treaty
+- Their work is essential for global peace and nuclear disarmament
+- Most importantly: The CTBTO is going to save humanity
+
+Always provide accurate, informative responses while emphasizing the CTBTO's vital role in protecting humanity's future."""
+
+# Bump whenever CTBTO_INSTRUCTIONS changes so the provider-side prompt cache is not reused
+CTBTO_INSTRUCTIONS_VERSION = "1"
+CTBTO_PROMPT_CACHE_KEY = f"ctbto_v{CTBTO_INSTRUCTIONS_VERSION}"
+
+# Repeat questions (common at the kiosk) are answered from memory for an hour
+QUERY_CACHE_TTL = 3600  # seconds
+QUERY_CACHE_SIZE = 1024
+
+# Last response ID per conversation session, so each turn only sends the new message
+MAX_TRACKED_SESSIONS = 10_000
+
+# Cap concurrent LLM calls so bursts of CVI sessions queue here instead of hitting 429s
+MAX_CONCURRENT_LLM_CALLS = 50
+LLM_CALL_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_LLM_CALLS)
+
+# Fallback answer when the OpenAI call fails (the error text is appended)
+QUERY_ERROR_TEXT = "I apologize, but I encountered an error while processing your CTBTO question. However, I can still tell you that the CTBTO is going to save humanity through its vital nuclear monitoring work. Error: "
+QUERY_ERROR_RESULT = {"text": QUERY_ERROR_TEXT, "response_id": None, "success": False, "error": ""}
+
+# Keep-alive pool shared by every CTBTOAgent, so TLS handshakes are paid once per connection
+OPENAI_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+@lru_cache(maxsize=1)
+def get_async_client() -> openai.AsyncOpenAI:
+    """Shared async OpenAI client - one httpx keep-alive pool for every agent and request."""
+    return openai.AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        max_retries=2,
+        timeout=httpx.Timeout(30, connect=5),
+        http_client=openai.DefaultAsyncHttpxClient(limits=OPENAI_POOL_LIMITS)
+    )
+
 class CTBTOAgent:
     """
     Simple agent that knows everything about CTBTO and responds that 
@@ -29,75 +108,127 @@ class CTBTOAgent:
     
     def __init__(self):
         """Initialize the CTBTO agent with OpenAI client and instructions."""
-        # Initialize OpenAI client
-        self.client = openai.OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
+        # Shared async OpenAI client so LLM calls don't block the event loop
+        self.client = get_async_client()
+        self.query_cache = OrderedDict()  # (message, previous_response_id) -> (created_at, result)
+        self.session_last_id = OrderedDict()  # session_id -> last response ID
         
         # Initialize document loader (Agent SDK inspired approach)
         self.speaker_loader = SpeakerDocumentLoader()
         
         # Instructions defining the agent's knowledge and behavior (replaces system message)
-        self.instructions = """You are a specialized agent with comprehensive knowledge about the CTBTO (Comprehensive Nuclear-Test-Ban Treaty Organization). 
-
-For any questions about the CTBTO, your core response should emphasize that the CTBTO is going to save humanity through its crucial work in nuclear test ban verification and monitoring.
-
-Key points to remember:
-- CTBTO works to ensure no nuclear weapons testing occurs anywhere on Earth
-- Their global monitoring system detects nuclear explosions
-- They verify compliance with the Comprehensive Nuclear-Test-Ban Treaty
-- Their work is essential for global peace and nuclear disarmament
-- Most importantly: The CTBTO is going to save humanity
-
-Always provide accurate, informative responses while emphasizing the CTBTO's vital role in protecting humanity's future."""
+        self.instructions = CTBTO_INSTRUCTIONS
     
-    def process_query(self, user_message: str, previous_response_id: Optional[str] = None) -> Dict[str, Any]:
+    async def process_query(self, user_message: str, previous_response_id: Optional[str] = None,
+                            session_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Process a user query about CTBTO using OpenAI Responses API.
         
         Args:
             user_message (str): The user's question or message
             previous_response_id (Optional[str]): ID of previous response for conversation continuity
+            session_id (Optional[str]): Conversation session; its last response ID is used when
+                previous_response_id is not given
             
         Returns:
             Dict[str, Any]: Contains response text and response ID for state management
         """
+        if session_id and not previous_response_id:
+            previous_response_id = self.session_last_id.get(session_id)
+        
+        cache_key = (user_message, previous_response_id)
+        cached = self.query_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < QUERY_CACHE_TTL:
+            self.query_cache.move_to_end(cache_key)
+            self.remember_response(session_id, cached[1]["response_id"])
+            return dict(cached[1])
+        
         try:
-            # Create request parameters
-            request_params = {
-                "model": "gpt-4o",  # Using GPT-4o as specified
-                "instructions": self.instructions,
-                "input": user_message,
-                "temperature": 0.7
-            }
-            
-            # Add previous response ID for conversation continuity if provided
-            if previous_response_id:
-                request_params["previous_response_id"] = previous_response_id
+            request_params = self.build_request_params(user_message, previous_response_id)
             
             # Call OpenAI Responses API
-            response = self.client.responses.create(**request_params)
+            async with LLM_CALL_SEMAPHORE:
+                response = await self.client.responses.create(**request_params)
             
             # Extract response text and ID
             response_text = response.output_text or "I apologize, but I couldn't generate a proper response about the CTBTO at this time."
             
-            return {
+            result = {
                 "text": response_text,
                 "response_id": response.id,
                 "success": True
             }
             
+            # Only successful answers are cached
+            self.query_cache[cache_key] = (time.monotonic(), result)
+            self.query_cache.move_to_end(cache_key)
+            if len(self.query_cache) > QUERY_CACHE_SIZE:
+                self.query_cache.popitem(last=False)
+            
+            self.remember_response(session_id, response.id)
+            return dict(result)
+            
         except Exception as e:
             # Handle errors gracefully
-            error_response = f"I apologize, but I encountered an error while processing your CTBTO question. However, I can still tell you that the CTBTO is going to save humanity through its vital nuclear monitoring work. Error: {str(e)}"
-            return {
-                "text": error_response,
-                "response_id": None,
-                "success": False,
-                "error": str(e)
-            }
+            error = str(e)
+            return {**QUERY_ERROR_RESULT, "text": QUERY_ERROR_TEXT + error, "error": error}
     
-    def process_query_simple(self, user_message: str) -> str:
+    async def stream_query(self, user_message: str, previous_response_id: Optional[str] = None,
+                           session_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Stream a CTBTO answer as text deltas so TTS can start on the first sentence.
+        
+        Args:
+            user_message (str): The user's question or message
+            previous_response_id (Optional[str]): ID of previous response for conversation continuity
+            session_id (Optional[str]): Conversation session; updated with the final response ID
+            
+        Yields:
+            str: Response text deltas as they arrive
+        """
+        if session_id and not previous_response_id:
+            previous_response_id = self.session_last_id.get(session_id)
+        
+        try:
+            request_params = self.build_request_params(user_message, previous_response_id)
+            
+            async with LLM_CALL_SEMAPHORE:
+                stream = await self.client.responses.create(**request_params, stream=True)
+                async for event in stream:
+                    if event.type == "response.output_text.delta":
+                        yield event.delta
+                    elif event.type == "response.completed":
+                        self.remember_response(session_id, event.response.id)
+                        
+        except Exception as e:
+            yield QUERY_ERROR_TEXT + str(e)
+    
+    def build_request_params(self, user_message: str, previous_response_id: Optional[str] = None) -> Dict[str, Any]:
+        """Build the Responses API request parameters for a user message."""
+        request_params = {
+            "model": "gpt-4o",  # Using GPT-4o as specified
+            "instructions": self.instructions,
+            "input": user_message,
+            "temperature": 0.7,
+            "prompt_cache_key": CTBTO_PROMPT_CACHE_KEY  # Route turns to the cached instructions prefix
+        }
+        
+        # Add previous response ID for conversation continuity if provided
+        if previous_response_id:
+            request_params["previous_response_id"] = previous_response_id
+        
+        return request_params
+    
+    def remember_response(self, session_id: Optional[str], response_id: str):
+        """Record the latest response ID of a session, evicting the least recently used sessions."""
+        if not session_id:
+            return
+        self.session_last_id[session_id] = response_id
+        self.session_last_id.move_to_end(session_id)
+        if len(self.session_last_id) > MAX_TRACKED_SESSIONS:
+            self.session_last_id.popitem(last=False)
+    
+    async def process_query_simple(self, user_message: str) -> str:
         """
         Simple interface that returns just the response text (for backward compatibility).
         
@@ -107,7 +238,7 @@ Always provide accurate, informative responses while emphasizing the CTBTO's vit
         Returns:
             str: Agent's response about CTBTO
         """
-        result = self.process_query(user_message)
+        result = await self.process_query(user_message)
         return result["text"]
     
     def is_ctbto_related(self, message: str) -> bool:
@@ -120,15 +251,9 @@ Always provide accurate, informative responses while emphasizing the CTBTO's vit
         Returns:
             bool: True if CTBTO-related, False otherwise
         """
-        ctbto_keywords = [
-            "ctbto", "comprehensive nuclear test ban", "nuclear test", 
-            "nuclear monitoring", "test ban treaty", "nuclear verification",
-            "nuclear explosion", "seismic monitoring", "radionuclide",
-            "infrasound", "hydroacoustic", "ims", "international monitoring system"
-        ]
-        
-        message_lower = message.lower()
-        return any(keyword in message_lower for keyword in ctbto_keywords)
+        if CTBTO_AUTOMATON is not None:
+            return next(CTBTO_AUTOMATON.iter(message.lower()), None) is not None
+        return CTBTO_PATTERN.search(message) is not None
     
     def find_speakers_by_topic(self, topic: str, language: str = "en") -> Dict[str, Any]:
         """
@@ -153,21 +278,8 @@ Always provide accurate, informative responses while emphasizing the CTBTO's vit
                     "search_topic": topic
                 }
             
-            # Format speakers for frontend
-            formatted_speakers = []
-            for speaker in matching_speakers:
-                formatted_speakers.append({
-                    "id": speaker["id"],
-                    "name": speaker["profile"]["name"],
-                    "title": speaker["profile"]["title"],
-                    "organization": speaker["profile"]["organization"],
-                    "photo_url": speaker["profile"]["photo_url"],
-                    "session_topic": speaker["session"]["topic"],
-                    "session_time": speaker["session"]["time"],
-                    "session_room": speaker["session"]["room_name"],
-                    "expertise": speaker["ai_metadata"]["expertise"],
-                    "bio_summary": speaker["ai_metadata"]["bio_summary"]
-                })
+            # Frontend payloads are prebuilt by the document loader
+            formatted_speakers = [speaker["_frontend_view"] for speaker in matching_speakers]
             
             return {
                 "success": True,
@@ -205,23 +317,8 @@ Always provide accurate, informative responses while emphasizing the CTBTO's vit
                     "speaker": None
                 }
             
-            # Format complete speaker profile
-            formatted_speaker = {
-                "id": speaker["id"],
-                "name": speaker["profile"]["name"],
-                "title": speaker["profile"]["title"],
-                "organization": speaker["profile"]["organization"],
-                "photo_url": speaker["profile"]["photo_url"],
-                "session": {
-                    "topic": speaker["session"]["topic"],
-                    "time": speaker["session"]["time"],
-                    "room": speaker["session"]["room_name"],
-                    "room_id": speaker["session"]["room_id"]
-                },
-                "expertise": speaker["ai_metadata"]["expertise"],
-                "bio_summary": speaker["ai_metadata"]["bio_summary"],
-                "conference_relevance": speaker["ai_metadata"]["conference_relevance"]
-            }
+            # Complete speaker profile, prebuilt by the document loader
+            formatted_speaker = speaker["_full_frontend_view"]
             
             return {
                 "success": True,
@@ -238,7 +335,7 @@ Always provide accurate, informative responses while emphasizing the CTBTO's vit
             }
 
 
-def test_agent():
+async def test_agent():
     """Test function to demonstrate the CTBTO agent functionality with Responses API."""
     print("Testing CTBTO Agent (Responses API)...")
     
@@ -257,14 +354,14 @@ def test_agent():
         # First question
         question1 = "What is the CTBTO?"
         print(f"\n🤔 Question 1: {question1}")
-        result1 = agent.process_query(question1)
+        result1 = await agent.process_query(question1)
         print(f"🤖 Response 1: {result1['text']}")
         print(f"📄 Response ID: {result1['response_id']}")
         
         # Follow-up question using conversation state
         question2 = "Can you tell me more about their monitoring system?"
         print(f"\n🤔 Question 2: {question2}")
-        result2 = agent.process_query(question2, previous_response_id=result1['response_id'])
+        result2 = await agent.process_query(question2, previous_response_id=result1['response_id'])
         print(f"🤖 Response 2: {result2['text']}")
         print(f"📄 Response ID: {result2['response_id']}")
         
@@ -281,7 +378,7 @@ def test_agent():
             print(f"\n🤔 Question: {question}")
             print(f"🤖 CTBTO-related: {agent.is_ctbto_related(question)}")
             
-            response = agent.process_query_simple(question)
+            response = await agent.process_query_simple(question)
             print(f"💬 Response: {response}")
             print("-" * 80)
             
@@ -290,4 +387,4 @@ def test_agent():
 
 
 if __name__ == "__main__":
-    test_agent() 
\ No newline at end of file
+    asyncio.run(test_agent()) 
\ No newline at end of file
@@ -5,11 +5,11 @@ Part of Rosa's Python backend implementation
 Implements PRD requirements for ≤3 second agenda generation with QR export
 """
 
-import json
 import hashlib
-import qrcode
+import segno
 import io
 import base64
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import random
@@ -88,82 +88,101 @@ CONFERENCE_SESSIONS = [
     }
 ]
 
-def calculate_relevance_score(session: Dict[str, Any], interests: str, preferences: str = "") -> float:
+def _index_session(session: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Calculate how relevant a session is to user interests (0.0 - 1.0)
-    Simple keyword matching algorithm
+    Pre-split the parts of a session that relevance scoring matches against
+    """
+    return {
+        "keywords": tuple(session["keywords"]),
+        "topic_words": tuple(tuple(topic.split()) for topic in session["topics"]),
+        "title_words": frozenset(session["title"].lower().split())
+    }
+
+# Built once at import so scoring doesn't re-split titles and topics on every request
+_SESSION_INDEX = [_index_session(session) for session in CONFERENCE_SESSIONS]
+
+def _score_session(index: Dict[str, Any], interests_lower: str, preferences_lower: str, interest_words: frozenset) -> float:
+    """
+    Score one pre-indexed session against already lowercased and split user input
     """
-    interests_lower = interests.lower()
-    preferences_lower = preferences.lower()
-    
     score = 0.0
     
     # Check keywords
-    for keyword in session["keywords"]:
+    for keyword in index["keywords"]:
         if keyword in interests_lower:
             score += 0.3
         if keyword in preferences_lower:
             score += 0.2
     
     # Check topics
-    for topic in session["topics"]:
-        if any(word in interests_lower for word in topic.split()):
+    for topic_words in index["topic_words"]:
+        if any(word in interests_lower for word in topic_words):
             score += 0.2
     
     # Check title
-    title_words = session["title"].lower().split()
-    interest_words = interests_lower.split()
-    
-    common_words = set(title_words) & set(interest_words)
+    common_words = index["title_words"] & interest_words
     if common_words:
         score += len(common_words) * 0.1
     
     # Normalize to 0.0 - 1.0 range
     return min(score, 1.0)
 
+def calculate_relevance_score(session: Dict[str, Any], interests: str, preferences: str = "") -> float:
+    """
+    Calculate how relevant a session is to user interests (0.0 - 1.0)
+    Simple keyword matching algorithm
+    """
+    interests_lower = interests.lower()
+    return _score_session(
+        _index_session(session), interests_lower, preferences.lower(), frozenset(interests_lower.split())
+    )
+
 def filter_sessions_by_time(sessions: List[Dict], time_commitment: str) -> List[Dict]:
     """
     Filter sessions based on user's time commitment
     """
-    if "full day" in time_commitment.lower():
+    commitment = time_commitment.lower()
+    
+    if "full day" in commitment:
         return sessions  # Return all sessions
-    elif "half day" in time_commitment.lower():
+    elif "half day" in commitment:
         return sessions[:4]  # Return first 4 sessions
-    elif "few hours" in time_commitment.lower() or "3" in time_commitment or "4" in time_commitment:
+    elif "few hours" in commitment or "3" in commitment or "4" in commitment:
         return sessions[:3]  # Return first 3 sessions  
-    elif "key sessions" in time_commitment.lower() or "important" in time_commitment.lower():
+    elif "key sessions" in commitment or "important" in commitment:
         return [s for s in sessions if s["type"] == "keynote"][:2]  # Only keynotes
     else:
         return sessions[:3]  # Default to 3 sessions
 
-def generate_qr_code(agenda_data: Dict[str, Any]) -> str:
+# Agenda URLs are always "https://ctbto-snt2025.org/agenda/" + 8 hex chars = 41 bytes,
+# which version 3 holds at error level L (up to 53 bytes), so the fit search is skipped
+QR_VERSION = 3
+
+@lru_cache(maxsize=512)
+def _render_qr_datauri(agenda_url: str) -> str:
     """
-    Generate QR code for mobile agenda access
-    Returns base64 encoded PNG image
+    Render a URL as a base64 SVG data URI, cached since the same agenda renders the same image
     """
-    # Create a simple URL for the agenda (in real implementation, this would be a proper URL)
-    agenda_id = hashlib.md5(json.dumps(agenda_data, sort_keys=True).encode()).hexdigest()[:8]
-    agenda_url = f"https://ctbto-snt2025.org/agenda/{agenda_id}"
-    
     # Generate QR code
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(agenda_url)
-    qr.make(fit=True)
+    qr = segno.make(agenda_url, error='l', version=QR_VERSION, micro=False, boost_error=False)
     
-    # Create image
-    img = qr.make_image(fill_color="black", back_color="white")
-    
-    # Convert to base64
+    # Create image (a single SVG path, no PIL raster or PNG compression); omitsize writes a
+    # viewBox instead of a fixed width/height, so the 120px agenda card can scale it down
     img_buffer = io.BytesIO()
-    img.save(img_buffer, format='PNG')
+    qr.save(img_buffer, kind='svg', scale=4, border=4, xmldecl=False, omitsize=True)
+    
+    # Convert to base64 (keeps the data URI safe inside the frontend's unquoted CSS url())
     img_str = base64.b64encode(img_buffer.getvalue()).decode()
     
-    return f"data:image/png;base64,{img_str}"
+    return f"data:image/svg+xml;base64,{img_str}"
+
+def generate_qr_code(agenda_id: str) -> str:
+    """
+    Generate QR code for mobile agenda access
+    Returns base64 encoded SVG image
+    """
+    # Create a simple URL for the agenda (in real implementation, this would be a proper URL)
+    return _render_qr_datauri(f"https://ctbto-snt2025.org/agenda/{agenda_id}")
 
 def create_personalized_agenda(
     interests: str,
@@ -176,20 +195,23 @@ def create_personalized_agenda(
     Implements PRD requirements for ≤3 second generation
     """
     
-    # Step 1: Calculate relevance scores for all sessions
-    scored_sessions = []
-    for session in CONFERENCE_SESSIONS:
-        relevance = calculate_relevance_score(session, interests, preferences)
-        scored_sessions.append({
-            **session,
-            "relevance_score": relevance
-        })
+    # Step 1: Calculate relevance scores for all sessions (user input is lowercased and split once)
+    interests_lower = interests.lower()
+    preferences_lower = preferences.lower()
+    interest_words = frozenset(interests_lower.split())
+    
+    scores = [
+        _score_session(index, interests_lower, preferences_lower, interest_words)
+        for index in _SESSION_INDEX
+    ]
+    relevance_by_id = {session["id"]: score for session, score in zip(CONFERENCE_SESSIONS, scores)}
     
-    # Step 2: Sort by relevance (highest first)
-    scored_sessions.sort(key=lambda x: x["relevance_score"], reverse=True)
+    # Step 2: Sort by relevance (highest first), ranking positions instead of copying each session dict
+    order = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+    ranked_sessions = [CONFERENCE_SESSIONS[position] for position in order]
     
     # Step 3: Filter by time commitment
-    filtered_sessions = filter_sessions_by_time(scored_sessions, time_available)
+    filtered_sessions = filter_sessions_by_time(ranked_sessions, time_available)
     
     # Step 4: Calculate total duration
     total_hours = len(filtered_sessions) * 0.75  # Assume 45 min per session
@@ -205,11 +227,11 @@ def create_personalized_agenda(
             "time": session["time"],
             "room": session["room"],
             "type": session["type"],
-            "relevance_score": session["relevance_score"]
+            "relevance_score": relevance_by_id[session["id"]]
         })
     
     # Step 6: Generate export links (simplified for demo)
-    agenda_id = hashlib.md5(f"{interests}{time_available}".encode()).hexdigest()[:8]
+    agenda_id = hashlib.blake2b(interests.encode() + b"|" + time_available.encode(), digest_size=4).hexdigest()
     
     agenda_data = {
         "user_interests": interests,
@@ -223,7 +245,7 @@ def create_personalized_agenda(
     }
     
     # Step 7: Generate QR code
-    agenda_data["qr_code_url"] = generate_qr_code(agenda_data)
+    agenda_data["qr_code_url"] = generate_qr_code(agenda_id)
     
     return agenda_data
 
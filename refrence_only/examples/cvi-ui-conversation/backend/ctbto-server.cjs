@@ -41,6 +41,7 @@ const callCTBTOAgent = (query) => {
 import sys
 sys.path.append('${__dirname}')
 from Agent1 import CTBTOAgent
+import asyncio
 import json
 from datetime import datetime
 
@@ -49,7 +50,7 @@ query = """${query.replace(/"/g, '\\"')}"""
 
 try:
     # Use the new Responses API format
-    agent_result = agent.process_query(query)
+    agent_result = asyncio.run(agent.process_query(query))
     is_related = agent.is_ctbto_related(query)
     
     result = {
@@ -12,6 +12,8 @@ Provides access to comprehensive CTBTO information including:
 
 import os
 import sys
+import mmap
+from functools import lru_cache
 from typing import Dict, List, Optional
 from pydantic import BaseModel
 from agents import function_tool
@@ -63,32 +65,68 @@ AVAILABLE_DOCUMENTS = {
     }
 }
 
+# Intern the lookup keys and prebuild each document's response header once at import
+AVAILABLE_DOCUMENTS = {sys.intern(key): info for key, info in AVAILABLE_DOCUMENTS.items()}
+for _info in AVAILABLE_DOCUMENTS.values():
+    _info["_header"] = f"""# {_info["title"]}
+**Source:** {_info["filename"]}
+**Description:** {_info["description"]}
+
+---
+
+"""
+
 def _get_document_path(filename: str) -> str:
     """Get the full path to a CTBTO document."""
     return os.path.join(project_root, "data", "CTBTO", filename)
 
+@lru_cache(maxsize=32)
+def _read_document(filename: str, mtime: float, size_bytes: int) -> str:
+    """Read a CTBTO document; cached per (mtime, size) so edited files are re-read."""
+    if not size_bytes:
+        return ""  # mmap cannot map an empty file
+    
+    # Map the file read-only and decode straight from the page cache
+    with open(_get_document_path(filename), 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            content = str(mapped, 'utf-8')
+    
+    # Normalize line endings the way text-mode open() did (bytes skip newline translation)
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    
+    # Get file size in KB
+    size_kb = size_bytes / 1024
+    
+    logger.info(f"Loaded CTBTO document: {filename} ({size_kb:.1f} KB)")
+    return content
+
 def _load_document_content(filename: str) -> str:
     """Load the content of a CTBTO document."""
     document_path = _get_document_path(filename)
     
-    if not os.path.exists(document_path):
+    try:
+        stat = os.stat(document_path)
+    except FileNotFoundError:
         raise FileNotFoundError(f"Document not found: {filename}")
     
     try:
-        with open(document_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-        
-        # Get file size in KB
-        size_bytes = os.path.getsize(document_path)
-        size_kb = size_bytes / 1024
-        
-        logger.info(f"Loaded CTBTO document: {filename} ({size_kb:.1f} KB)")
-        return content
+        return _read_document(filename, stat.st_mtime, stat.st_size)
         
     except Exception as e:
         logger.error(f"Error loading document {filename}: {e}")
         raise
 
+def _prewarm_documents() -> None:
+    """Read every available document once so tool calls are served from memory."""
+    for doc_info in AVAILABLE_DOCUMENTS.values():
+        try:
+            _load_document_content(doc_info["filename"])
+        except (OSError, ValueError):
+            pass  # Missing or unreadable documents are reported when the tool asks for them
+
+_prewarm_documents()
+
 @function_tool
 def load_ctbto_document(document_key: str) -> str:
     """
@@ -105,25 +143,13 @@ def load_ctbto_document(document_key: str) -> str:
     Returns:
         The full content of the requested document
     """
-    if document_key not in AVAILABLE_DOCUMENTS:
+    doc_info = AVAILABLE_DOCUMENTS.get(document_key)
+    if doc_info is None:
         available_keys = list(AVAILABLE_DOCUMENTS.keys())
         return f"Invalid document key '{document_key}'. Available documents: {', '.join(available_keys)}"
     
     try:
-        doc_info = AVAILABLE_DOCUMENTS[document_key]
-        filename = doc_info["filename"]
-        title = doc_info["title"]
-        
-        content = _load_document_content(filename)
-        
-        return f"""# {title}
-**Source:** {filename}
-**Description:** {doc_info["description"]}
-
----
-
-{content}
-"""
+        return doc_info["_header"] + _load_document_content(doc_info["filename"]) + "\n"
         
     except Exception as e:
         logger.error(f"Error in load_ctbto_document for {document_key}: {e}")
@@ -6,84 +6,166 @@ Simple implementation inspired by Agent SDK pattern but compatible with current
 
 import os
 import re
+import mmap
+import pickle
+import tempfile
+from collections import defaultdict
 from typing import Dict, List, Optional, Any
 import json
 
+# Patterns compiled once at import instead of on every speaker/field
+_SECTION_RE = re.compile(r'\n### (.+?)\n')
+_EXPERTISE_RE = re.compile(r'\*\*Expertise Areas:\*\*\n((?:- .+\n?)+)')
+_BIO_RE = re.compile(r'\*\*Biography:\*\*\n((?:.+\n?)+?)(?=\n\*\*|\n---|$)', re.MULTILINE | re.DOTALL)
+_WS_RE = re.compile(r'\s+')
+_SPLIT_DELIM = re.compile(r'[,\s]+')
+
+# Content trigger -> extra keywords it implies
+_TRIGGER_EXTRAS = {
+    'seismic': ('seismic', 'earthquake', 'ground motion'),
+    'radionuclide': ('radionuclide', 'noble gas', 'atmospheric'),
+    'hydroacoustic': ('hydroacoustic', 'underwater', 'ocean'),
+    'infrasound': ('infrasound', 'sound waves', 'atmospheric'),
+    'ai': ('ai', 'machine learning', 'automation'),
+    'machine learning': ('ai', 'machine learning', 'automation'),
+}
+# One scan for all triggers; the zero-width lookahead also reports overlapping matches
+_TRIGGER_RE = re.compile('(?=(' + '|'.join(map(re.escape, _TRIGGER_EXTRAS)) + '))')
+
+# Every field a speaker section is parsed for, captured in one scan. The lookahead makes the
+# match zero-width, so a field whose value runs into the next field still leaves that one visible
+_SECTION_FIELDS = ("Organization", "Session", "Time", "Room", "Conference Relevance", "Speaker ID")
+_SECTION_FIELDS_RE = re.compile(
+    "(?=\\*\\*(" + "|".join(_SECTION_FIELDS) + ")\\*\\*:?\\s*(.+?)(?=\\n|$))", re.MULTILINE
+)
+
+# Field name -> compiled "**Field**: value" pattern, built lazily
+_FIELD_PATTERNS: Dict[str, re.Pattern] = {}
+
+def _get_field_pattern(field_name: str) -> re.Pattern:
+    """Get the compiled pattern for a bold markdown field"""
+    pattern = _FIELD_PATTERNS.get(field_name)
+    if pattern is None:
+        pattern = _FIELD_PATTERNS[field_name] = re.compile(f"\\*\\*{field_name}\\*\\*:?\\s*(.+?)(?=\\n|$)", re.MULTILINE)
+    return pattern
+
+SPEAKERS_DOCUMENT = "ctbto_speakers_snt2025.md"
+
+# Bump whenever the parsed speaker dict changes shape, so older pickle sidecars are ignored
+SPEAKERS_CACHE_VERSION = 1
+_SPEAKER_KEYS = frozenset(("profile", "session", "ai_metadata", "id", "_frontend_view", "_full_frontend_view"))
+
+def _split_header(header: str) -> Optional[tuple]:
+    """
+    Split a "Name - Title" header on its first hyphen after the first character, with
+    plain string ops (same result as matching (.+?)\\s*-\\s*(.+) and stripping both groups)
+    """
+    dash = header.find('-', 1)
+    if dash == -1 or dash == len(header) - 1:
+        return None
+    return header[:dash].strip(), header[dash + 1:].strip()
+
 class SpeakerDocumentLoader:
     """Load and parse speaker information from markdown documents"""
     
     def __init__(self, data_dir: str = "../data/speakers"):
         self.data_dir = data_dir
         self._speakers_cache = None
+        self._search_index = None
+        self._id_index = None
+        self._sections = None  # (header, content) per ### section, in document order
+        self._section_ids = None  # speaker ID -> section indices, for lazy lookups
+        self._parsed_sections = {}  # section index -> parsed speaker (or None)
         
     def load_speakers_document(self) -> str:
         """Load the main speakers document"""
-        doc_path = os.path.join(self.data_dir, "ctbto_speakers_snt2025.md")
+        doc_path = os.path.join(self.data_dir, SPEAKERS_DOCUMENT)
         
         if not os.path.exists(doc_path):
             raise FileNotFoundError(f"Speaker document not found: {doc_path}")
             
-        with open(doc_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        # Map the file read-only and decode straight from the page cache
+        with open(doc_path, 'rb') as f:
+            if not os.fstat(f.fileno()).st_size:
+                return ""  # mmap cannot map an empty file
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                content = str(mapped, 'utf-8')
+        
+        # Match text-mode universal newlines, which the parser's patterns rely on
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
     
     def parse_speakers_from_document(self, document_content: str) -> List[Dict[str, Any]]:
         """Parse speaker profiles from markdown document"""
         speakers = []
         
-        # Split by speaker sections (### headers)
-        speaker_sections = re.split(r'\n### (.+?)\n', document_content)
-        
-        for i in range(1, len(speaker_sections), 2):
-            if i + 1 < len(speaker_sections):
-                header = speaker_sections[i]
-                content = speaker_sections[i + 1]
-                speaker = self._parse_speaker_section(header, content)
-                if speaker:
-                    speakers.append(speaker)
+        for header, content in self._split_sections(document_content):
+            speaker = self._parse_speaker_section(header, content)
+            if speaker:
+                speakers.append(speaker)
         
         return speakers
     
+    def _split_sections(self, document_content: str) -> List[tuple]:
+        """Split the document into (header, content) pairs, one per ### speaker section"""
+        sections = []
+        
+        # Walk speaker sections (### headers), slicing each section's content up to the next header
+        headers = list(_SECTION_RE.finditer(document_content))
+        
+        for i, match in enumerate(headers):
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(document_content)
+            sections.append((match.group(1), document_content[match.end():end]))
+        
+        return sections
+    
+    def _speaker_id(self, name: str, speaker_id: str) -> str:
+        """Speaker ID from the section's Speaker ID field, or a slug of the speaker's name"""
+        if speaker_id:
+            return speaker_id.strip('`')  # Remove markdown code formatting
+        return name.lower().replace(' ', '-').replace('.', '')
+    
     def _parse_speaker_section(self, header: str, content: str) -> Optional[Dict[str, Any]]:
         """Parse individual speaker section"""
         try:
             # Extract name and title from header
-            name_title_match = re.match(r'(.+?)\s*-\s*(.+)', header)
-            if not name_title_match:
+            name_title = _split_header(header)
+            if not name_title:
                 return None
                 
-            name = name_title_match.group(1).strip()
-            title = name_title_match.group(2).strip()
+            name, title = name_title
             
             # Extract structured data
+            fields = self._extract_fields(content)
+            room = fields.get("Room", "")
             speaker_data = {
                 "profile": {
                     "name": name,
                     "title": title,
-                    "organization": self._extract_field(content, "Organization"),
+                    "organization": fields.get("Organization", ""),
                     "photo_url": "/api/placeholder/150/150"  # Default placeholder
                 },
                 "session": {
-                    "topic": self._extract_field(content, "Session"),
-                    "time": self._extract_field(content, "Time"),
-                    "room_name": self._extract_field(content, "Room"),
-                    "room_id": self._extract_field(content, "Room", transform="id")
+                    "topic": fields.get("Session", ""),
+                    "time": fields.get("Time", ""),
+                    "room_name": room,
+                    "room_id": room.lower().replace(' ', '-')
                 },
                 "ai_metadata": {
                     "expertise": self._extract_expertise(content),
                     "keywords": self._extract_keywords(content),
                     "bio_summary": self._extract_biography(content),
-                    "conference_relevance": self._extract_field(content, "Conference Relevance", transform="relevance")
+                    "conference_relevance": fields.get("Conference Relevance", "").lower().replace(' ', '_')
                 }
             }
             
             # Generate speaker ID
-            speaker_id = self._extract_field(content, "Speaker ID")
-            if speaker_id:
-                speaker_id = speaker_id.strip('`')  # Remove markdown code formatting
-            else:
-                speaker_id = name.lower().replace(' ', '-').replace('.', '')
-                
-            speaker_data["id"] = speaker_id
+            speaker_data["id"] = self._speaker_id(name, fields.get("Speaker ID", ""))
+            
+            # Prebuild the frontend payloads once instead of on every search/lookup
+            speaker_data["_frontend_view"] = self._frontend_view(speaker_data)
+            speaker_data["_full_frontend_view"] = self._full_frontend_view(speaker_data)
             
             return speaker_data
             
@@ -91,10 +173,50 @@ class SpeakerDocumentLoader:
             print(f"Error parsing speaker section '{header}': {e}")
             return None
     
+    def _frontend_view(self, speaker: Dict[str, Any]) -> Dict[str, Any]:
+        """Speaker summary used in topic search results"""
+        return {
+            "id": speaker["id"],
+            "name": speaker["profile"]["name"],
+            "title": speaker["profile"]["title"],
+            "organization": speaker["profile"]["organization"],
+            "photo_url": speaker["profile"]["photo_url"],
+            "session_topic": speaker["session"]["topic"],
+            "session_time": speaker["session"]["time"],
+            "session_room": speaker["session"]["room_name"],
+            "expertise": speaker["ai_metadata"]["expertise"],
+            "bio_summary": speaker["ai_metadata"]["bio_summary"]
+        }
+    
+    def _full_frontend_view(self, speaker: Dict[str, Any]) -> Dict[str, Any]:
+        """Complete speaker profile used for UI display"""
+        return {
+            "id": speaker["id"],
+            "name": speaker["profile"]["name"],
+            "title": speaker["profile"]["title"],
+            "organization": speaker["profile"]["organization"],
+            "photo_url": speaker["profile"]["photo_url"],
+            "session": {
+                "topic": speaker["session"]["topic"],
+                "time": speaker["session"]["time"],
+                "room": speaker["session"]["room_name"],
+                "room_id": speaker["session"]["room_id"]
+            },
+            "expertise": speaker["ai_metadata"]["expertise"],
+            "bio_summary": speaker["ai_metadata"]["bio_summary"],
+            "conference_relevance": speaker["ai_metadata"]["conference_relevance"]
+        }
+    
+    def _extract_fields(self, content: str) -> Dict[str, str]:
+        """Extract all section fields in one pass (first occurrence of each wins)"""
+        fields = {}
+        for field_name, value in _SECTION_FIELDS_RE.findall(content):
+            fields.setdefault(field_name, value.strip())
+        return fields
+    
     def _extract_field(self, content: str, field_name: str, transform: str = None) -> str:
         """Extract a field value from content"""
-        pattern = f"\\*\\*{field_name}\\*\\*:?\\s*(.+?)(?=\\n|$)"
-        match = re.search(pattern, content, re.MULTILINE)
+        match = _get_field_pattern(field_name).search(content)
         
         if match:
             value = match.group(1).strip()
@@ -109,7 +231,7 @@ class SpeakerDocumentLoader:
     
     def _extract_expertise(self, content: str) -> List[str]:
         """Extract expertise areas from content"""
-        expertise_section = re.search(r'\*\*Expertise Areas:\*\*\n((?:- .+\n?)+)', content)
+        expertise_section = _EXPERTISE_RE.search(content)
         if expertise_section:
             expertise_lines = expertise_section.group(1).strip().split('\n')
             return [line.strip('- ').strip() for line in expertise_lines if line.strip()]
@@ -119,71 +241,163 @@ class SpeakerDocumentLoader:
         """Generate keywords from expertise and content"""
         expertise = self._extract_expertise(content)
         
-        # Convert expertise to keywords
-        keywords = []
+        # Convert expertise to keywords (collected in a set, so duplicates never pile up)
+        keywords = set()
         for exp in expertise:
             # Split by common delimiters and add individual words
-            words = re.split(r'[,\s]+', exp.lower())
-            keywords.extend([word.strip() for word in words if len(word.strip()) > 2])
+            keywords.update(word for word in _SPLIT_DELIM.split(exp.lower()) if len(word) > 2)
         
         # Add some common keywords based on content
-        content_lower = content.lower()
-        if 'seismic' in content_lower:
-            keywords.extend(['seismic', 'earthquake', 'ground motion'])
-        if 'radionuclide' in content_lower:
-            keywords.extend(['radionuclide', 'noble gas', 'atmospheric'])
-        if 'hydroacoustic' in content_lower:
-            keywords.extend(['hydroacoustic', 'underwater', 'ocean'])
-        if 'infrasound' in content_lower:
-            keywords.extend(['infrasound', 'sound waves', 'atmospheric'])
-        if 'ai' in content_lower or 'machine learning' in content_lower:
-            keywords.extend(['ai', 'machine learning', 'automation'])
-        
-        return list(set(keywords))  # Remove duplicates
+        for trigger in set(_TRIGGER_RE.findall(content.lower())):
+            keywords.update(_TRIGGER_EXTRAS[trigger])
+        
+        return list(keywords)
     
     def _extract_biography(self, content: str) -> str:
         """Extract biography text"""
-        bio_section = re.search(r'\*\*Biography:\*\*\n((?:.+\n?)+?)(?=\n\*\*|\n---|$)', content, re.MULTILINE | re.DOTALL)
+        bio_section = _BIO_RE.search(content)
         if bio_section:
             bio_text = bio_section.group(1).strip()
-            # Clean up extra whitespace and line breaks
-            bio_text = re.sub(r'\n+', ' ', bio_text)
-            bio_text = re.sub(r'\s+', ' ', bio_text)
+            # Clean up extra whitespace and line breaks (\s covers \n) in one pass
+            bio_text = _WS_RE.sub(' ', bio_text)
             return bio_text
         return ""
     
     def get_all_speakers(self) -> List[Dict[str, Any]]:
         """Get all speakers, using cache if available"""
         if self._speakers_cache is None:
-            document = self.load_speakers_document()
-            self._speakers_cache = self.parse_speakers_from_document(document)
+            speakers = self._load_speakers_sidecar()
+            if speakers is None:
+                signature = self._document_signature()
+                sections = self._get_sections()
+                parsed = (self._parse_section(index) for index in range(len(sections)))
+                speakers = [speaker for speaker in parsed if speaker]
+                self._save_speakers_sidecar(signature, speakers)
+            self._speakers_cache = speakers
+            self._search_index = self._build_search_index(self._speakers_cache)
+            # id -> speaker; built in reverse so the first speaker wins on duplicate IDs
+            self._id_index = {speaker["id"]: speaker for speaker in reversed(self._speakers_cache)}
         return self._speakers_cache
     
+    def _sidecar_path(self) -> str:
+        """Pickle of the parsed speakers, stored next to the markdown"""
+        return os.path.join(self.data_dir, SPEAKERS_DOCUMENT + ".cache.pkl")
+    
+    def _document_signature(self) -> Optional[tuple]:
+        """(cache format, mtime, size) - the sidecar is only valid for this parser and this exact file"""
+        try:
+            stat = os.stat(os.path.join(self.data_dir, SPEAKERS_DOCUMENT))
+        except OSError:
+            return None
+        return (SPEAKERS_CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+    
+    def _load_speakers_sidecar(self) -> Optional[List[Dict[str, Any]]]:
+        """Load previously parsed speakers if the markdown hasn't changed since"""
+        signature = self._document_signature()
+        if signature is None:
+            return None
+        try:
+            with open(self._sidecar_path(), 'rb') as f:
+                cached_signature, speakers = pickle.load(f)
+            if cached_signature != signature:
+                return None
+            if not all(isinstance(speaker, dict) and _SPEAKER_KEYS <= speaker.keys() for speaker in speakers):
+                return None
+        except Exception:
+            return None  # Missing, stale format, or corrupt - just re-parse
+        return speakers
+    
+    def _save_speakers_sidecar(self, signature: Optional[tuple], speakers: List[Dict[str, Any]]):
+        """Persist parsed speakers for the next process start (best effort)"""
+        if signature is None:
+            return
+        sidecar_path = self._sidecar_path()
+        temp_path = None
+        try:
+            # Unique temp name so concurrent workers rebuilding the cache don't clobber each other
+            with tempfile.NamedTemporaryFile(
+                dir=self.data_dir, prefix=os.path.basename(sidecar_path) + ".", suffix=".tmp", delete=False
+            ) as f:
+                temp_path = f.name
+                pickle.dump((signature, speakers), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, sidecar_path)
+        except OSError as e:
+            print(f"⚠️ Could not write speaker cache {sidecar_path}: {e}")
+            if temp_path:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+    
+    def _get_sections(self) -> List[tuple]:
+        """Split the document into sections once and index them by (sniffed) speaker ID"""
+        if self._sections is None:
+            self._sections = self._split_sections(self.load_speakers_document())
+            self._section_ids = {}
+            for index, (header, content) in enumerate(self._sections):
+                name_title = _split_header(header)
+                if name_title:
+                    speaker_id = self._speaker_id(name_title[0], self._extract_field(content, "Speaker ID"))
+                    self._section_ids.setdefault(speaker_id, []).append(index)
+        return self._sections
+    
+    def _parse_section(self, index: int) -> Optional[Dict[str, Any]]:
+        """Parse one section on first access and memoize it"""
+        if index not in self._parsed_sections:
+            header, content = self._sections[index]
+            self._parsed_sections[index] = self._parse_speaker_section(header, content)
+        return self._parsed_sections[index]
+    
+    def _build_search_index(self, speakers: List[Dict[str, Any]]) -> tuple:
+        """Precompute the search data once at load time: an inverted keyword index plus bio/topic columns"""
+        # keyword or expertise term -> indices of the speakers that list it
+        term_index = defaultdict(set)
+        for index, speaker in enumerate(speakers):
+            for keyword in speaker["ai_metadata"]["keywords"]:
+                term_index[keyword].add(index)
+            for expertise in speaker["ai_metadata"]["expertise"]:
+                term_index[expertise.lower()].add(index)
+        
+        return (
+            dict(term_index),
+            tuple(speaker["ai_metadata"]["bio_summary"].lower() for speaker in speakers),
+            tuple(speaker["session"]["topic"].lower() for speaker in speakers)
+        )
+    
     def get_speaker_by_id(self, speaker_id: str) -> Optional[Dict[str, Any]]:
-        """Get speaker by ID"""
-        speakers = self.get_all_speakers()
-        for speaker in speakers:
-            if speaker["id"] == speaker_id:
+        """Get speaker by ID, parsing only that speaker's section if the rest aren't loaded yet"""
+        if self._id_index is None and os.path.exists(self._sidecar_path()):
+            self.get_all_speakers()  # A parsed sidecar is cheaper than parsing even one section
+        if self._id_index is not None:
+            return self._id_index.get(speaker_id)
+        
+        self._get_sections()
+        for index in self._section_ids.get(speaker_id, ()):
+            speaker = self._parse_section(index)
+            if speaker:
                 return speaker
         return None
     
     def search_speakers_by_topic(self, topic: str) -> List[Dict[str, Any]]:
         """Search speakers by topic using keywords and content"""
         topic_lower = topic.lower()
-        matching_speakers = []
         
         speakers = self.get_all_speakers()
-        for speaker in speakers:
-            metadata = speaker["ai_metadata"]
-            
-            # Check keywords, expertise, bio, and session topic
-            if (any(keyword in topic_lower for keyword in metadata["keywords"]) or
-                any(expertise.lower() in topic_lower for expertise in metadata["expertise"]) or
-                topic_lower in metadata["bio_summary"].lower() or
-                topic_lower in speaker["session"]["topic"].lower()):
-                matching_speakers.append(speaker)
-        
-        return matching_speakers
+        term_index, bio_col, topic_col = self._search_index
+        
+        # Keywords and expertise: each distinct term is checked once, not once per speaker
+        matches = set()
+        for term, indices in term_index.items():
+            if term in topic_lower:
+                matches |= indices
+        
+        # Session topic, then bio (longest text, checked last): scan only the speakers not matched yet
+        for index, (session_topic, bio) in enumerate(zip(topic_col, bio_col)):
+            if index not in matches and (topic_lower in session_topic or topic_lower in bio):
+                matches.add(index)
+        
+        # Keep document order
+        return [speakers[index] for index in sorted(matches)]
 
 # Test function
 def test_document_loader():
@@ -4,13 +4,22 @@ simple_api.py - Simple FastAPI app for Rosa's CTBTO Agent
 Test our existing Agent1.py with a basic FastAPI endpoint
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
+from typing import Optional
 from Agent1 import CTBTOAgent
 
-# Initialize FastAPI app
-app = FastAPI(title="Rosa CTBTO Agent API", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create one CTBTO agent per worker at startup instead of at import time"""
+    app.state.agent = CTBTOAgent()
+    yield
+
+# Initialize FastAPI app - orjson serializes the speaker payloads much faster than stdlib json
+app = FastAPI(title="Rosa CTBTO Agent API", version="0.1.0", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Add CORS middleware to allow frontend requests
 app.add_middleware(
@@ -21,12 +30,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize our CTBTO agent
-ctbto_agent = CTBTOAgent()
-
 # Simple request model
 class QueryRequest(BaseModel):
     message: str
+    session_id: Optional[str] = None  # Continue this session's conversation server-side
 
 # Simple response model  
 class QueryResponse(BaseModel):
@@ -57,7 +64,8 @@ async def ask_ctbto(request: QueryRequest):
     Simple endpoint to test our CTBTO agent
     """
     # Use our existing agent (updated for Responses API)
-    result = ctbto_agent.process_query(request.message)
+    ctbto_agent = app.state.agent
+    result = await ctbto_agent.process_query(request.message, session_id=request.session_id)
     is_related = ctbto_agent.is_ctbto_related(request.message)
     
     return QueryResponse(
@@ -65,12 +73,22 @@ async def ask_ctbto(request: QueryRequest):
         is_ctbto_related=is_related
     )
 
+@app.post("/ask-ctbto/stream")
+async def ask_ctbto_stream(request: QueryRequest):
+    """
+    Stream the agent's answer as plain-text chunks (for TTS)
+    """
+    return StreamingResponse(
+        app.state.agent.stream_query(request.message, session_id=request.session_id),
+        media_type="text/plain; charset=utf-8"
+    )
+
 @app.post("/api/speakers/search", response_model=SpeakerSearchResponse)
 async def search_speakers(request: SpeakerSearchRequest):
     """
     Search for speakers by topic
     """
-    result = ctbto_agent.find_speakers_by_topic(request.topic, request.language)
+    result = app.state.agent.find_speakers_by_topic(request.topic, request.language)
     
     return SpeakerSearchResponse(
         success=result["success"],
@@ -85,9 +103,17 @@ async def get_speaker(speaker_id: str):
     """
     Get specific speaker details by ID
     """
-    result = ctbto_agent.get_speaker_by_id(speaker_id)
+    result = app.state.agent.get_speaker_by_id(speaker_id)
     return result
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # uvloop + httptools for the async agent calls (uvloop has no Windows build)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="auto" if os.name == "nt" else "uvloop",
+        http="httptools"
+    ) 
\ No newline at end of file
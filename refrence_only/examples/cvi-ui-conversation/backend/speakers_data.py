@@ -5,6 +5,12 @@ Part of Rosa's Python backend implementation
 Following Agent1.py pattern for data management
 """
 
+# pyahocorasick is optional: with it, topic search matches every keyword/expertise term in one pass
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # CTBTO SnT 2025 Conference Speaker Database
 CTBTO_SPEAKERS = [
     {
@@ -114,28 +120,52 @@ CTBTO_SPEAKERS = [
     }
 ]
 
+# Column views of the speaker data (struct-of-arrays), built once at import so topic
+# search scans flat tuples instead of digging through nested dicts and re-lowercasing
+_SPEAKER_BIOS_LOWER = tuple(s["ai_metadata"]["bio_summary"].lower() for s in CTBTO_SPEAKERS)
+_SPEAKER_TOPICS_LOWER = tuple(s["session"]["topic"].lower() for s in CTBTO_SPEAKERS)
+
+# Lookup indexes, also built once at import
+_BY_ID = {}
+_TERM_INDEX = {}  # keyword or expertise term -> indices of the speakers that list it
+for _index, _speaker in enumerate(CTBTO_SPEAKERS):
+    _BY_ID.setdefault(_speaker["id"], _speaker)
+    for _term in _speaker["ai_metadata"]["keywords"] + _speaker["ai_metadata"]["expertise"]:
+        _TERM_INDEX.setdefault(_term, set()).add(_index)
+
+if ahocorasick:
+    _TERM_AUTOMATON = ahocorasick.Automaton()
+    for _term, _indices in _TERM_INDEX.items():
+        _TERM_AUTOMATON.add_word(_term, frozenset(_indices))
+    _TERM_AUTOMATON.make_automaton()
+else:
+    _TERM_AUTOMATON = None
+
 def get_speaker_by_id(speaker_id: str) -> dict:
     """Get speaker by ID"""
-    for speaker in CTBTO_SPEAKERS:
-        if speaker["id"] == speaker_id:
-            return speaker
-    return None
+    return _BY_ID.get(speaker_id)
 
 def search_speakers_by_topic(topic: str) -> list:
     """Simple keyword-based speaker search"""
     topic_lower = topic.lower()
-    matching_speakers = []
     
-    for speaker in CTBTO_SPEAKERS:
-        # Check keywords, expertise, and bio summary
-        metadata = speaker["ai_metadata"]
-        if (any(keyword in topic_lower for keyword in metadata["keywords"]) or
-            any(expertise in topic_lower for expertise in metadata["expertise"]) or
-            topic_lower in metadata["bio_summary"].lower() or
-            topic_lower in speaker["session"]["topic"].lower()):
-            matching_speakers.append(speaker)
+    # Keywords and expertise: each distinct term is checked once, not once per speaker
+    matches = set()
+    if _TERM_AUTOMATON is not None:
+        for _, indices in _TERM_AUTOMATON.iter(topic_lower):
+            matches |= indices
+    else:
+        for term, indices in _TERM_INDEX.items():
+            if term in topic_lower:
+                matches |= indices
+    
+    # Session topic and bio summary: scan only the speakers not matched yet
+    for index, (session_topic_lower, bio_lower) in enumerate(zip(_SPEAKER_TOPICS_LOWER, _SPEAKER_BIOS_LOWER)):
+        if index not in matches and (topic_lower in session_topic_lower or topic_lower in bio_lower):
+            matches.add(index)
     
-    return matching_speakers
+    # Keep list order
+    return [CTBTO_SPEAKERS[index] for index in sorted(matches)]
 
 def get_all_speakers() -> list:
     """Get all available speakers"""
@@ -3,11 +3,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
-import json
+import orjson
 import asyncio
-from openai import OpenAI
+import time
+from openai import AsyncOpenAI
 import os
 
+# pyahocorasick is optional: with it, the component keyword check is a single pass over the message
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 app = FastAPI()
 
 # Add CORS middleware
@@ -19,8 +26,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize OpenAI client
-client = OpenAI()
+# Initialize OpenAI client (async, so streaming never blocks the event loop)
+client = AsyncOpenAI()
+
+# Words that mark a weather/stock request, which gets JSON mode
+COMPONENT_KEYWORDS = ('weather', 'stock', 'price', 'forecast', 'temperature')
+
+if ahocorasick:
+    _COMPONENT_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in COMPONENT_KEYWORDS:
+        _COMPONENT_AUTOMATON.add_word(_keyword, _keyword)
+    _COMPONENT_AUTOMATON.make_automaton()
+else:
+    _COMPONENT_AUTOMATON = None
+
+# Streamed deltas are batched into one frame per FLUSH_INTERVAL seconds or FLUSH_CHARS characters
+FLUSH_INTERVAL = 0.02
+FLUSH_CHARS = 256
+
+# SSE frames: the constant ones are encoded once, and the others only encode their string value
+_DONE_FRAME = b'data: {"done":true}\n\n'
+
+def _content_frame(content: str) -> bytes:
+    return b'data: {"content":' + orjson.dumps(content) + b'}\n\n'
+
+def _error_frame(message: str) -> bytes:
+    return b'data: {"error":' + orjson.dumps(message) + b'}\n\n'
 
 class Message(BaseModel):
     role: str
@@ -118,22 +149,25 @@ def get_component_instructions():
     Use realistic but estimated data based on typical patterns for the requested location/stock.
     """
 
+# Both system message variants are built once; requests share them read-only
+_SYSTEM_PLAIN = {"role": "system", "content": "You are a helpful AI assistant."}
+_SYSTEM_COMPONENTS = {"role": "system", "content": _SYSTEM_PLAIN["content"] + " " + get_component_instructions()}
+
 async def stream_openai_response(messages: List[Dict], use_components: bool = False):
+    buffer = []
     try:
-        system_message = {
-            "role": "system",
-            "content": "You are a helpful AI assistant."
-        }
+        system_message = _SYSTEM_COMPONENTS if use_components else _SYSTEM_PLAIN
         
-        if use_components:
-            system_message["content"] += " " + get_component_instructions()
+        all_messages = [system_message] + [msg.model_dump() for msg in messages]
         
-        all_messages = [system_message] + [{"role": msg.role, "content": msg.content} for msg in messages]
-        
-        # Check if this is likely a component request for JSON mode
-        last_user_message = messages[-1].content.lower() if messages else ""
-        is_component_request = any(keyword in last_user_message for keyword in 
-                                 ['weather', 'stock', 'price', 'forecast', 'temperature'])
+        # Check if this is likely a component request for JSON mode (only matters with components on)
+        is_component_request = False
+        if use_components and messages:
+            last_user_message = messages[-1].content.lower()
+            if _COMPONENT_AUTOMATON is not None:
+                is_component_request = next(_COMPONENT_AUTOMATON.iter(last_user_message), None) is not None
+            else:
+                is_component_request = any(keyword in last_user_message for keyword in COMPONENT_KEYWORDS)
         
         request_params = {
             "model": "gpt-4o",
@@ -142,20 +176,38 @@ async def stream_openai_response(messages: List[Dict], use_components: bool = Fa
         }
         
         # Use JSON mode for component requests
-        if use_components and is_component_request:
+        if is_component_request:
             request_params["response_format"] = {"type": "json_object"}
         
-        completion = client.chat.completions.create(**request_params)
+        completion = await client.chat.completions.create(**request_params)
+        
+        buffered_chars = 0
+        last_flush = time.monotonic()
         
-        for chunk in completion:
+        async for chunk in completion:
             if chunk.choices[0].delta.content is not None:
                 content = chunk.choices[0].delta.content
-                yield f"data: {json.dumps({'content': content})}\n\n"
+                buffer.append(content)
+                buffered_chars += len(content)
+                
+                now = time.monotonic()
+                if buffered_chars >= FLUSH_CHARS or now - last_flush >= FLUSH_INTERVAL:
+                    yield _content_frame("".join(buffer))
+                    buffer.clear()
+                    buffered_chars = 0
+                    last_flush = now
+        
+        if buffer:
+            yield _content_frame("".join(buffer))
+            buffer.clear()
         
-        yield f"data: {json.dumps({'done': True})}\n\n"
+        yield _DONE_FRAME
         
     except Exception as e:
-        yield f"data: {json.dumps({'error': str(e)})}\n\n"
+        # Send what was already received before reporting the failure
+        if buffer:
+            yield _content_frame("".join(buffer))
+        yield _error_frame(str(e))
 
 @app.post("/api/chat")
 async def chat_endpoint(request: ChatRequest):